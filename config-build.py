@@ -11,72 +11,79 @@ This script:
 This script intentionally does *not* run any simulations.
 """
 
+import os
 import subprocess
 import argparse
 from pathlib import Path
-import json
 import shutil
 import sys
+import threading
+import time
+
+from core_sim import load_json
 
 
 def load_executable_name(config_file):
     """Extract `executable_name` from the JSON config (default: champsim)."""
     try:
-        with open(config_file, 'r') as f:
-            cfg = json.load(f)
-            return cfg.get("executable_name", "champsim")
+        cfg = load_json(config_file)
+        return cfg.get("executable_name", "champsim")
     except Exception as e:
         print(f"Warning: could not read executable_name: {e}")
         return "champsim"
 
 
+def _remove_dirs(dirs):
+    for d in dirs:
+        shutil.rmtree(d, ignore_errors=True)
+
+
 def configure_champsim(root, config_file):
     """
     Run config.sh <config_file> and wipe previous .csconfig directory.
+
+    The old directory is renamed aside and removed in the background, along
+    with any left over by an earlier run that exited before removing its own.
     """
     csconfig_dir = root / ".csconfig"
     if csconfig_dir.exists():
         print("Cleaning previous configuration...")
-        shutil.rmtree(csconfig_dir)
+        # Move it out of the way and delete it while config.sh and make run
+        os.rename(
+            csconfig_dir,
+            csconfig_dir.with_name(f".csconfig.old.{os.getpid()}.{time.time_ns()}"),
+        )
+
+    stale = [d for d in root.glob(".csconfig.old.*") if d.is_dir()]
+    if stale:
+        # The thread is non-daemon, so the interpreter waits for it at exit
+        threading.Thread(target=_remove_dirs, args=(stale,)).start()
 
     config_script = root / "config.sh"
 
-    print(f"Running config.sh with: {config_file}")
-    result = subprocess.run(
+    print(f"Running config.sh with: {config_file}", flush=True)
+    subprocess.run(
         ["python3", str(config_script), str(config_file)],
         cwd=root,
         check=True,
-        capture_output=True,
-        text=True
     )
 
-    if result.stdout:
-        print(result.stdout)
-    if result.stderr:
-        print("STDERR:", result.stderr)
-
     print("✓ Configuration completed successfully")
 
 
 def build_champsim(root):
     """
-    Run `make` in the ChampSim root directory.
+    Run `make -j<ncpus>` in the ChampSim root directory, streaming its output.
     """
-    print("Building ChampSim...")
+    jobs = os.cpu_count() or 4
+    print(f"Building ChampSim with {jobs} jobs...", flush=True)
 
-    result = subprocess.run(
-        ["make"],
+    subprocess.run(
+        ["make", f"-j{jobs}"],
         cwd=root,
         check=True,
-        capture_output=True,
-        text=True
     )
 
-    if result.stdout:
-        print(result.stdout)
-    if result.stderr:
-        print("STDERR:", result.stderr)
-
     print("✓ Build completed successfully")
 
 
@@ -115,18 +122,14 @@ def main():
     try:
         configure_champsim(champsim_root, config_path)
     except subprocess.CalledProcessError as e:
-        print("✗ Configuration failed")
-        print("STDOUT:", e.stdout)
-        print("STDERR:", e.stderr)
+        print(f"✗ Configuration failed (exit code {e.returncode})")
         return 1
 
     # Build
     try:
         build_champsim(champsim_root)
     except subprocess.CalledProcessError as e:
-        print("✗ Build failed")
-        print("STDOUT:", e.stdout)
-        print("STDERR:", e.stderr)
+        print(f"✗ Build failed (exit code {e.returncode})")
         return 1
 
     # Verify the binary
@@ -0,0 +1,537 @@
+"""
+ChampSim simulation core
+
+Shared pieces of the ChampSim helper scripts: config loading, trace
+discovery and the SimulationManager that runs traces in parallel.
+"""
+
+import os
+import mmap
+import re
+import selectors
+import signal
+import subprocess
+import sys
+import time
+import json
+import datetime
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from queue import Empty, SimpleQueue
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Compound suffixes precede their bare forms so the longest match is stripped
+TRACE_SUFFIXES = (
+    ".champsimtrace.xz",
+    ".champsimtrace.gz",
+    ".champsimtrace",
+    ".trace.xz",
+    ".trace.gz",
+    ".trace",
+    ".champsim",
+    ".champsim.gz",
+)
+
+# Printed by ChampSim once every CPU has finished, before the stats
+COMPLETION_SENTINEL = b"ChampSim completed all CPUs"
+
+# Footer line written by SimulationManager after reaping a successful child
+SUCCESS_STATUS = b"EXIT_STATUS: 0\n"
+
+_JSON_CACHE = {}  # (path, mtime_ns) -> parsed config
+
+
+def load_json(path):
+    """Parse a JSON file, reusing the result while the file is unchanged."""
+    path = Path(path)
+    key = (str(path), path.stat().st_mtime_ns)
+    cfg = _JSON_CACHE.get(key)
+    if cfg is None:
+        data = path.read_bytes()
+        cfg = orjson.loads(data) if orjson is not None else json.loads(data)
+        _JSON_CACHE[key] = cfg
+    return cfg
+
+
+def load_skip_list(skip_file: Path) -> set[str]:
+    if skip_file is None or not skip_file.exists():
+        return set()
+
+    patterns = set()
+    for line in skip_file.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        patterns.add(line)
+    return patterns
+
+
+@dataclass
+class ActiveSim:
+    """A running simulation, from launch until its exit is reaped."""
+    proc: subprocess.Popen
+    trace: str
+    name: str
+    log_path: Path
+    log_fd: int
+    start_time: float
+    cpu: Optional[int] = None
+
+
+class SimulationManager:
+    def __init__(
+        self,
+        champsim_root,
+        config_file,
+        traces_dir,
+        num_parallel,
+        warmup_instrs,
+        sim_instrs,
+        skip_patterns,
+        results_base=None,
+        pin_cpus=False,
+        resume=False,
+    ):
+        self.champsim_root = Path(champsim_root).resolve()
+        self.config_file = Path(config_file).resolve()
+        self.num_parallel = num_parallel
+        self.warmup_instrs = warmup_instrs
+        self.sim_instrs = sim_instrs
+        self.skip_patterns = skip_patterns
+        # One alternation tests a trace name against every pattern in C
+        self._skip_re = (
+            re.compile("|".join(re.escape(p) for p in sorted(skip_patterns)))
+            if skip_patterns else None
+        )
+        self.resume = resume
+
+        # Resolve traces directory (absolute or under champsim_root/traces)
+        traces_dir = Path(traces_dir)
+        if traces_dir.is_absolute():
+            self.traces_dir = traces_dir
+        else:
+            self.traces_dir = self.champsim_root / "traces" / traces_dir
+
+        self.trace_set_name = self.traces_dir.name
+        self._trace_cache = None
+
+        # Load executable name from JSON
+        self.executable_name = self._get_executable_name()
+
+        # Resolve results base
+        if results_base is not None:
+            results_root = Path(results_base).resolve()
+        else:
+            results_root = self.champsim_root / "results"
+
+        run_root = results_root / self.trace_set_name / self.executable_name
+
+        # Timestamp (--resume reuses the most recent run directory)
+        self.run_timestamp = self._latest_timestamp(run_root) if resume else None
+        if self.run_timestamp is None:
+            self.run_timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        self.results_base = run_root / self.run_timestamp
+
+        # Elapsed seconds per trace from earlier runs, shared by all timestamps
+        # and kept apart per instruction counts
+        self.history_path = run_root / "_runtimes.json"
+        self.history_key = f"warmup={warmup_instrs} sim={sim_instrs}"
+
+        # Banner lines ChampSim prints (src/main.cc) with the counts it ran;
+        # --resume only trusts logs that match this run's counts
+        self.log_header = (
+            f"Warmup Instructions: {warmup_instrs}\n"
+            f"Simulation Instructions: {sim_instrs}\n"
+        ).encode()
+
+        # Process tracking
+        self.active = {}      # pid -> ActiveSim (waitpid(-1) reports pids)
+        self.completed = []   # (trace, elapsed_seconds)
+        self.failed = []      # (trace, elapsed_seconds)
+
+        # Exit notification: one pidfd per child (Linux >= 5.3), else polling
+        self.selector = selectors.DefaultSelector() if hasattr(os, "pidfd_open") else None
+        self.pidfds = {}      # pid -> pidfd registered with self.selector
+        # Without pidfds, SIGCHLD wakes the wait instead. SimpleQueue.put() is
+        # reentrant, unlike Event.set(), so it is safe from a signal handler
+        self.child_exits = SimpleQueue()
+        self._previous_sigchld = None  # handler to restore once ours is installed
+
+        # Simulations pinned per allowed CPU (empty when pinning is off)
+        if pin_cpus and hasattr(os, "sched_getaffinity"):
+            self.cpu_load = dict.fromkeys(sorted(os.sched_getaffinity(0)), 0)
+        else:
+            self.cpu_load = {}
+
+    def _get_executable_name(self):
+        try:
+            cfg = load_json(self.config_file)
+            return cfg.get("executable_name", "champsim")
+        except Exception:
+            return "champsim"
+
+    @staticmethod
+    def _latest_timestamp(run_root):
+        if not run_root.is_dir():
+            return None
+
+        runs = [d.name for d in run_root.glob("????????_??????") if d.is_dir()]
+        return max(runs, default=None)
+
+    def validate_inputs(self):
+        if not self.traces_dir.exists():
+            print(f"ERROR: traces directory not found: {self.traces_dir}")
+            return False
+
+        if not self.get_trace_files():
+            print(f"ERROR: no trace files found in {self.traces_dir}")
+            return False
+
+        binary = self.champsim_root / "bin" / self.executable_name
+        if not binary.exists():
+            print(f"ERROR: ChampSim binary not found: {binary}")
+            return False
+
+        return True
+
+    def get_trace_files(self):
+        if self._trace_cache is None:
+            with os.scandir(self.traces_dir) as it:
+                self._trace_cache = sorted(
+                    e.path for e in it
+                    if e.name.endswith(TRACE_SUFFIXES) and e.is_file()
+                )
+        return list(self._trace_cache)
+
+    def create_result_dir(self):
+        self.results_base.mkdir(parents=True, exist_ok=True)
+
+    def get_result_filename(self, trace_file):
+        trace_name = os.path.basename(trace_file)
+
+        for ext in TRACE_SUFFIXES:
+            stripped = trace_name.removesuffix(ext)
+            if len(stripped) != len(trace_name):
+                return f"{stripped}.log"
+
+        return f"{trace_name}.log"
+
+    def _load_all_history(self):
+        """Return {history key: {trace name: elapsed seconds}} from the sidecar."""
+        try:
+            runs = load_json(self.history_path)
+        except (OSError, ValueError):
+            return {}
+        return {k: v for k, v in runs.items() if isinstance(v, dict)}
+
+    def load_history(self):
+        """Return {trace name: elapsed seconds} recorded for these instruction counts."""
+        return dict(self._load_all_history().get(self.history_key, {}))
+
+    def save_history(self, history):
+        for trace, elapsed in self.completed:
+            history[os.path.basename(trace)] = round(elapsed, 3)
+
+        runs = self._load_all_history()
+        runs[self.history_key] = history
+        with open(self.history_path, "w") as f:
+            json.dump(runs, f, indent=2, sort_keys=True)
+
+    def expected_runtimes(self, history):
+        """
+        Return {trace name: expected seconds} for every trace file.
+
+        Traces with a recorded runtime use it. The rest are estimated from
+        their size at the median seconds per byte of the recorded ones, so
+        both kinds sort on one scale.
+        """
+        sizes = {
+            os.path.basename(t): os.path.getsize(t) for t in self.get_trace_files()
+        }
+        rates = [
+            history[name] / size for name, size in sizes.items()
+            if name in history and size > 0
+        ]
+        rate = statistics.median(rates) if rates else 1.0
+        return {name: history.get(name, size * rate) for name, size in sizes.items()}
+
+    def _already_done(self, trace_name):
+        log_path = self.results_base / self.get_result_filename(trace_name)
+        try:
+            with open(log_path, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # The footer is only written once the child has been reaped,
+                # so a log cut short or a non-zero exit after the sentinel
+                # is run again, as is one made with other instruction counts
+                sentinel = mm.rfind(COMPLETION_SENTINEL)
+                return (
+                    sentinel >= 0
+                    and mm.find(SUCCESS_STATUS, sentinel) >= 0
+                    and mm.find(self.log_header, 0, sentinel) >= 0
+                )
+        except (OSError, ValueError):
+            # Missing or empty log
+            return False
+
+    def launch(self, trace_file, trace_name):
+        exe = self.champsim_root / "bin" / self.executable_name
+
+        log_filename = self.get_result_filename(trace_name)
+        log_path = self.results_base / log_filename
+
+        cmd = [
+            str(exe),
+            "--warmup-instructions", str(self.warmup_instrs),
+            "--simulation-instructions", str(self.sim_instrs),
+            trace_file,
+        ]
+
+        fd = None
+        try:
+            # The child writes the log itself through a raw fd. Our copy stays
+            # open for the footer: it shares the child's file offset, so the
+            # footer lands after the last byte the child wrote
+            fd = os.open(
+                log_path,
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC,
+                0o644,
+            )
+            start_time = time.time()
+            # close_fds=False (with an absolute exe and no cwd) lets CPython
+            # take its posix_spawn fast path instead of fork+exec; every fd
+            # we open is non-inheritable, so nothing extra leaks to the child
+            proc = subprocess.Popen(
+                cmd,
+                stdout=fd,
+                stderr=subprocess.STDOUT,
+                close_fds=False,
+            )
+
+            print(f"  [PID {proc.pid}] Launched: {trace_name}")
+            print(f"             Output: {log_path}")
+
+            cpu = self._tune(proc.pid)
+            self.active[proc.pid] = ActiveSim(
+                proc, trace_file, trace_name, log_path, fd, start_time, cpu
+            )
+
+        except Exception as e:
+            if fd is not None:
+                os.close(fd)
+            print(f"✗ Launch failed for {trace_file}: {e}")
+            self.failed.append((trace_file, 0.0))
+            return
+
+        self._watch(proc.pid)
+
+    def _tune(self, pid):
+        """Run a child as SCHED_BATCH on the least loaded CPU; return that CPU."""
+        try:
+            os.sched_setscheduler(pid, os.SCHED_BATCH, os.sched_param(0))
+        except (AttributeError, OSError):
+            pass
+
+        if not self.cpu_load:
+            return None
+
+        cpu = min(self.cpu_load, key=self.cpu_load.get)
+        try:
+            os.sched_setaffinity(pid, {cpu})
+        except OSError:
+            return None
+
+        self.cpu_load[cpu] += 1
+        return cpu
+
+    def _watch(self, pid):
+        if self.selector is None:
+            return
+
+        try:
+            fd = os.pidfd_open(pid)
+        except OSError:
+            # Kernel without pidfd support: fall back to SIGCHLD
+            self._close_selector()
+            self._install_sigchld()
+            return
+
+        self.selector.register(fd, selectors.EVENT_READ, pid)
+        self.pidfds[pid] = fd
+
+    def _unwatch(self, pid):
+        fd = self.pidfds.pop(pid, None)
+        if fd is not None:
+            self.selector.unregister(fd)
+            os.close(fd)
+
+    def _close_selector(self):
+        if self.selector is None:
+            return
+
+        for fd in self.pidfds.values():
+            os.close(fd)
+        self.pidfds.clear()
+        self.selector.close()
+        self.selector = None
+
+    def _on_sigchld(self, signum, frame):
+        self.child_exits.put(signum)
+
+    def _install_sigchld(self):
+        # Only needed without pidfds; otherwise nothing drains child_exits
+        if self._previous_sigchld is None:
+            self._previous_sigchld = signal.signal(signal.SIGCHLD, self._on_sigchld)
+
+    def _restore_sigchld(self):
+        if self._previous_sigchld is not None:
+            signal.signal(signal.SIGCHLD, self._previous_sigchld)
+            self._previous_sigchld = None
+
+    def _wait_for_exits(self):
+        """Block until at least one active simulation exits; return their pids."""
+        while self.active:
+            if self.selector is not None:
+                self.selector.select()
+            else:
+                try:
+                    self.child_exits.get(timeout=5)
+                except Empty:
+                    pass
+                while not self.child_exits.empty():
+                    self.child_exits.get_nowait()
+
+            done = self._reap()
+            if done:
+                return done
+
+        return []
+
+    def _reap(self):
+        """Collect every exited child with one waitpid(-1) per exit."""
+        done = []
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if pid not in self.active:
+                continue
+
+            self.active[pid].proc.returncode = os.waitstatus_to_exitcode(status)
+            self._unwatch(pid)
+            done.append(pid)
+
+        return done
+
+    def _finish(self, pid):
+        sim = self.active.pop(pid)
+        if sim.cpu is not None:
+            self.cpu_load[sim.cpu] -= 1
+
+        elapsed = time.time() - sim.start_time
+        elapsed_str = str(datetime.timedelta(seconds=int(elapsed)))
+
+        footer = (
+            "\n"
+            "========================================\n"
+            f"WALL_CLOCK_TIME: {elapsed_str}\n"
+            f"EXIT_STATUS: {sim.proc.returncode}\n"
+            "========================================\n"
+        ).encode()
+        try:
+            os.write(sim.log_fd, footer)
+        finally:
+            os.close(sim.log_fd)
+
+        if sim.proc.returncode == 0:
+            print(f"✓ [PID {pid}] Completed: {sim.name} ({elapsed_str})")
+            self.completed.append((sim.trace, elapsed))
+        else:
+            print(
+                f"✗ [PID {pid}] Failed ({sim.proc.returncode}): "
+                f"{sim.name} ({elapsed_str})"
+            )
+            self.failed.append((sim.trace, elapsed))
+
+    def run(self):
+        all_traces = self.get_trace_files()
+
+        filtered = []
+        skipped = []
+
+        # (path, basename) pairs so the name is derived once per trace
+        for t in all_traces:
+            name = os.path.basename(t)
+            if self._skip_re is not None and self._skip_re.search(name):
+                skipped.append(name)
+            else:
+                filtered.append((t, name))
+
+        if skipped:
+            print("Skipping traces:")
+            for s in skipped:
+                print(f"  - {s}")
+            print()
+
+        if self.resume:
+            pending = [
+                (t, name) for t, name in filtered
+                if not self._already_done(name)
+            ]
+            print(f"Resuming {self.results_base}: "
+                  f"{len(filtered) - len(pending)} traces already complete\n")
+            filtered = pending
+
+        # Longest expected runtime first so no big one is left for the tail
+        history = self.load_history()
+        expected = self.expected_runtimes(history)
+        queue = sorted(filtered, key=lambda item: expected[item[1]], reverse=True)
+        self.create_result_dir()
+        self.run_start_time = time.time()
+
+        print(f"Total traces found: {len(all_traces)}")
+        print(f"Traces after filtering: {len(queue)}")
+        print(f"Parallel sims: {self.num_parallel}")
+        print(f"Binary: {self.executable_name}")
+        print(f"Traces directory: {self.traces_dir}")
+        print(f"Results directory: {self.results_base}\n")
+
+        if self.selector is None:
+            self._install_sigchld()
+
+        print("Launching initial batch of simulations...")
+        for _ in range(min(self.num_parallel, len(queue))):
+            self.launch(*queue.pop(0))
+
+        while self.active or queue:
+            for pid in self._wait_for_exits():
+                self._finish(pid)
+
+            while queue and len(self.active) < self.num_parallel:
+                self.launch(*queue.pop(0))
+
+        self._close_selector()
+        self._restore_sigchld()
+
+        if self.completed:
+            self.save_history(history)
+
+        total_elapsed = time.time() - self.run_start_time
+        total_str = str(datetime.timedelta(seconds=int(total_elapsed)))
+
+        print("\nSummary:")
+        print(f"  Completed: {len(self.completed)}")
+        print(f"  Failed:    {len(self.failed)}")
+        print(f"  Total wall time: {total_str}")
+        sys.stdout.flush()
+
+        return len(self.failed) == 0
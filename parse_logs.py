@@ -14,31 +14,49 @@ For each timestamp folder containing .log files:
       <suite>_<executable>_<timestamp>.csv
 
 Dots are replaced with underscores.
+
+Parsed metrics are also kept in _parse_cache.json inside each folder, so
+a later run only re-parses logs whose size or mtime changed.
 """
 
 import os
 import sys
-import re
 import csv
+import json
+import mmap
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Printed by ChampSim (src/main.cc) once every CPU has finished, just
+# before the statistics
+COMPLETION_SENTINEL = b'ChampSim completed all CPUs'
+
+CSV_HEADERS = [
+    'trace_name',
+    'IPC',
+    'L1D_total_access', 'L1D_miss_rate', 'L1D_avg_miss_latency', 'L1D_prefetch_accuracy',
+    'L2C_total_access', 'L2C_miss_rate', 'L2C_avg_miss_latency', 'L2C_prefetch_accuracy',
+    'LLC_total_access', 'LLC_miss_rate', 'LLC_avg_miss_latency', 'LLC_prefetch_accuracy',
+]
+
+# Bump whenever parsing changes, so _parse_cache.json entries from an older
+# parser are re-parsed rather than reused
+CACHE_VERSION = 2
+
+# Cache name in the log (after 'cpu0->') -> column prefix in the CSV
+CACHE_PREFIX = {b'cpu0_L1D': 'L1D', b'cpu0_L2C': 'L2C', b'LLC': 'LLC'}
 
 # ============================================================
-# =============== ORIGINAL PARSER LOGIC (UNCHANGED) ==========
+# ===================== LOG PARSER LOGIC =====================
 # ============================================================
 
 class LogParser:
     def __init__(self, results_dir):
         self.results_dir = Path(results_dir)
+        self.cache_path = self.results_dir / '_parse_cache.json'
 
-    def parse_log_file(self, log_file):
-        try:
-            with open(log_file, 'r') as f:
-                content = f.read()
-        except Exception as e:
-            print(f"Error reading {log_file}: {e}")
-            return None
-
+    @staticmethod
+    def parse_log_file(log_file):
         metrics = {}
 
         filename = Path(log_file).stem
@@ -49,129 +67,172 @@ class LogParser:
 
         metrics['trace_name'] = filename
 
-        ipc = re.search(r'CPU 0 cumulative IPC: ([\d.]+)', content)
-        metrics['IPC'] = float(ipc.group(1)) if ipc else None
+        try:
+            with open(log_file, 'rb') as f:
+                # mmap refuses empty files; those simply yield no metrics
+                if os.fstat(f.fileno()).st_size > 0:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        LogParser._parse_stats(mm, metrics)
+        except OSError as e:
+            print(f"Error reading {log_file}: {e}")
+            return None
 
-        # ---------- L1D ----------
-        l1d_total = re.search(r'cpu0->cpu0_L1D TOTAL.*?ACCESS:\s+(\d+)', content)
-        metrics['L1D_total_access'] = int(l1d_total.group(1)) if l1d_total else None
+        for header in CSV_HEADERS:
+            metrics.setdefault(header, None)
 
-        l1d_miss = re.search(
-            r'cpu0->cpu0_L1D TOTAL.*?ACCESS:\s+\d+.*?HIT:\s+\d+.*?MISS:\s+(\d+)',
-            content, re.DOTALL
-        )
-        if l1d_total and l1d_miss:
-            total = int(l1d_total.group(1))
-            miss = int(l1d_miss.group(1))
-            metrics['L1D_miss_rate'] = (miss / total * 100) if total > 0 else 0
-        else:
-            metrics['L1D_miss_rate'] = None
-
-        l1d_lat = re.search(r'cpu0->cpu0_L1D AVERAGE MISS LATENCY: ([\d.]+|-)', content)
-        metrics['L1D_avg_miss_latency'] = (
-            float(l1d_lat.group(1)) if l1d_lat and l1d_lat.group(1) != '-' else None
-        )
+        return metrics
 
-        # ---------- L2C ----------
-        l2c_total = re.search(r'cpu0->cpu0_L2C TOTAL.*?ACCESS:\s+(\d+)', content)
-        metrics['L2C_total_access'] = int(l2c_total.group(1)) if l2c_total else None
+    @staticmethod
+    def _parse_stats(mm, metrics):
+        """
+        Fill `metrics` from the statistics lines of a memory-mapped log.
+
+        Every statistic sits on one line with a fixed label, so each one is
+        located with find() on the map and only that line is split. The
+        stats are printed after ChampSim's completion line; starting from
+        there (found by a backwards scan) keeps the searches off the
+        heartbeat output. Logs without it are searched from the top.
+        Multi-core logs repeat these stats per section; the first wins.
+        """
+        start = max(mm.rfind(COMPLETION_SENTINEL), 0)
+
+        def lines(label):
+            """Yield the fields of each line at or after `start` that begins with `label`."""
+            pos = mm.find(label, start)
+            while pos >= 0:
+                if pos == 0 or mm[pos - 1] == ord('\n'):
+                    eol = mm.find(b'\n', pos)
+                    yield mm[pos:eol if eol >= 0 else len(mm)].split()
+                pos = mm.find(label, pos + 1)
+
+        # Field positions follow the format strings in src/plain_printer.cc:
+        #   CPU 0 cumulative IPC: <x> instructions: <n> cycles: <n>
+        #   cpu0->LLC TOTAL ACCESS: <n> HIT: <n> MISS: <n> ...
+        #   cpu0->LLC PREFETCH REQUESTED: <n> ISSUED: <n> USEFUL: <n> ...
+        #   cpu0->LLC AVERAGE MISS LATENCY: <x> cycles
+        # A line cut short (e.g. a log truncated mid-write) leaves only the
+        # statistics it is missing as None
+        def field(fields, index, parse):
+            try:
+                return parse(fields[index])
+            except (IndexError, ValueError):
+                return None
 
-        l2c_miss = re.search(
-            r'cpu0->cpu0_L2C TOTAL.*?ACCESS:\s+\d+.*?HIT:\s+\d+.*?MISS:\s+(\d+)',
-            content, re.DOTALL
-        )
-        if l2c_total and l2c_miss:
-            total = int(l2c_total.group(1))
-            miss = int(l2c_miss.group(1))
-            metrics['L2C_miss_rate'] = (miss / total * 100) if total > 0 else 0
-        else:
-            metrics['L2C_miss_rate'] = None
-
-        l2c_lat = re.search(r'cpu0->cpu0_L2C AVERAGE MISS LATENCY: ([\d.]+|-)', content)
-        metrics['L2C_avg_miss_latency'] = (
-            float(l2c_lat.group(1)) if l2c_lat and l2c_lat.group(1) != '-' else None
+        ipc = next(
+            (ipc for ipc in (field(f, 4, float) for f in lines(b'CPU 0 cumulative IPC:'))
+             if ipc is not None), None
         )
+        if ipc is not None:
+            metrics['IPC'] = ipc
+
+        for cache, prefix in CACHE_PREFIX.items():
+            label = b'cpu0->' + cache
+
+            fields = next(lines(label + b' TOTAL '), None)
+            if fields:
+                total = field(fields, 3, int)
+                miss = field(fields, 7, int)
+                if total is not None:
+                    metrics[f'{prefix}_total_access'] = total
+                    if miss is not None:
+                        metrics[f'{prefix}_miss_rate'] = (miss / total * 100) if total > 0 else 0
+
+            fields = next(lines(label + b' AVERAGE MISS LATENCY:'), None)
+            if fields:
+                # '-' when there were no misses
+                metrics[f'{prefix}_avg_miss_latency'] = field(fields, 4, float)
+
+            fields = next(lines(label + b' PREFETCH REQUESTED:'), None)
+            if fields:
+                requested = field(fields, 3, int)
+                useful = field(fields, 7, int)
+                if requested is not None and useful is not None:
+                    metrics[f'{prefix}_prefetch_accuracy'] = (
+                        (useful / requested * 100) if requested > 0 else 0
+                    )
+
+    def load_cache(self):
+        """Return {log name: {mtime_ns, size, metrics}} from a previous run."""
+        try:
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+            return {}
+        return cache.get('logs', {})
+
+    def scan(self):
+        """
+        List the folder's logs and split them against the sidecar cache.
+
+        Returns the (log_file, stat) pairs that still need parsing; logs
+        whose size and mtime match the cache are kept for store().
+        """
+        self.log_files = sorted(self.results_dir.glob("*.log"))
+        self.cache = {}
+
+        if not self.log_files:
+            print(f"No logs found in {self.results_dir}")
+            return []
 
-        # ---------- LLC ----------
-        llc_total = re.search(r'cpu0->LLC TOTAL.*?ACCESS:\s+(\d+)', content)
-        metrics['LLC_total_access'] = int(llc_total.group(1)) if llc_total else None
+        print(f"Found {len(self.log_files)} logs in {self.results_dir}")
 
-        llc_miss = re.search(
-            r'cpu0->LLC TOTAL.*?ACCESS:\s+\d+.*?HIT:\s+\d+.*?MISS:\s+(\d+)',
-            content, re.DOTALL
-        )
-        if llc_total and llc_miss:
-            total = int(llc_total.group(1))
-            miss = int(llc_miss.group(1))
-            metrics['LLC_miss_rate'] = (miss / total * 100) if total > 0 else 0
-        else:
-            metrics['LLC_miss_rate'] = None
-
-        llc_lat = re.search(r'cpu0->LLC AVERAGE MISS LATENCY: ([\d.]+|-)', content)
-        metrics['LLC_avg_miss_latency'] = (
-            float(llc_lat.group(1)) if llc_lat and llc_lat.group(1) != '-' else None
-        )
+        old_cache = self.load_cache()
+        stale = []
+        for log_file in self.log_files:
+            st = log_file.stat()
+            entry = old_cache.get(log_file.name)
+            if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                self.cache[log_file.name] = entry
+            else:
+                stale.append((log_file, st))
 
-        # ---------- Prefetch ----------
-        def pref_acc(pattern):
-            m = re.search(pattern, content, re.DOTALL)
-            if not m:
-                return None
-            requested = int(m.group(1))
-            useful = int(m.group(2))
-            return (useful / requested * 100) if requested > 0 else 0
+        if stale:
+            print(f"Parsing {len(stale)} new or changed logs")
 
-        metrics['L1D_prefetch_accuracy'] = pref_acc(
-            r'cpu0->cpu0_L1D PREFETCH REQUESTED:\s+(\d+).*?USEFUL:\s+(\d+)'
-        )
-        metrics['L2C_prefetch_accuracy'] = pref_acc(
-            r'cpu0->cpu0_L2C PREFETCH REQUESTED:\s+(\d+).*?USEFUL:\s+(\d+)'
-        )
+        return stale
 
-        llc_pref = re.search(
-            r'cpu0->LLC PREFETCH REQUESTED:\s+(\d+).*?ISSUED:\s+\d+.*?USEFUL:\s+(\d+)',
-            content, re.DOTALL
-        )
-        if llc_pref:
-            req = int(llc_pref.group(1))
-            use = int(llc_pref.group(2))
-            metrics['LLC_prefetch_accuracy'] = (use / req * 100) if req > 0 else 0
-        else:
-            metrics['LLC_prefetch_accuracy'] = None
+    def store(self, stale, results):
+        """Merge freshly parsed metrics into the cache, save it, and return all metrics."""
+        if not self.log_files:
+            return []
 
-        return metrics
+        for (log_file, st), m in zip(stale, results):
+            if m:
+                self.cache[log_file.name] = {
+                    'mtime_ns': st.st_mtime_ns,
+                    'size': st.st_size,
+                    'metrics': m,
+                }
+
+        with open(self.cache_path, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'logs': self.cache}, f)
+
+        return [
+            self.cache[log_file.name]['metrics']
+            for log_file in self.log_files if log_file.name in self.cache
+        ]
 
     def process_directory(self):
-        log_files = list(self.results_dir.glob("*.log"))
-        metrics = []
+        stale = self.scan()
+        results = []
 
-        if not log_files:
-            print(f"No logs found in {self.results_dir}")
-            return metrics
-
-        print(f"Found {len(log_files)} logs in {self.results_dir}")
-
-        for log_file in sorted(log_files):
-            m = self.parse_log_file(log_file)
-            if m:
-                metrics.append(m)
+        if stale:
+            # Logs are independent and parsing is CPU bound: fan out across cores
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+                results = list(ex.map(
+                    self.parse_log_file, [log for log, _ in stale], chunksize=8
+                ))
 
-        return metrics
+        return self.store(stale, results)
 
     def write_csv(self, metrics_list, csv_path):
-        headers = [
-            'trace_name',
-            'IPC',
-            'L1D_total_access', 'L1D_miss_rate', 'L1D_avg_miss_latency', 'L1D_prefetch_accuracy',
-            'L2C_total_access', 'L2C_miss_rate', 'L2C_avg_miss_latency', 'L2C_prefetch_accuracy',
-            'LLC_total_access', 'LLC_miss_rate', 'LLC_avg_miss_latency', 'LLC_prefetch_accuracy',
-        ]
-
         with open(csv_path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            for row in metrics_list:
-                writer.writerow(row)
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADERS)
+            writer.writerows([m.get(h) for h in CSV_HEADERS] for m in metrics_list)
 
         print(f"✓ Wrote CSV: {csv_path}")
 
@@ -190,6 +251,9 @@ def main():
 
     print("Walking results/ ...\n")
 
+    # (parser, csv_path, stale logs) for every folder that needs a CSV
+    jobs = []
+
     # Iterate over all subdirectories of results/
     for timestamp_dir in results_root.rglob("*"):
         if not timestamp_dir.is_dir():
@@ -215,7 +279,21 @@ def main():
 
         print(f"\n=== Processing {timestamp_dir} ===")
         parser = LogParser(timestamp_dir)
-        metrics = parser.process_directory()
+        jobs.append((parser, csv_path, parser.scan()))
+
+    # Parse the stale logs of every folder in one pool, so a tree of many
+    # small folders keeps all cores busy instead of one folder at a time
+    all_stale = [log for _, _, stale in jobs for log, _ in stale]
+    results = []
+    if all_stale:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            results = list(ex.map(LogParser.parse_log_file, all_stale, chunksize=16))
+
+    # Results come back in submission order: hand each folder its slice
+    offset = 0
+    for parser, csv_path, stale in jobs:
+        metrics = parser.store(stale, results[offset:offset + len(stale)])
+        offset += len(stale)
         parser.write_csv(metrics, csv_path)
 
     print("\nDone.")
@@ -1,66 +1,128 @@
 #!/usr/bin/env python3
+import os
+import mmap
+import posixpath
 import sys
 import re
 import csv
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
 
 TIMESTAMP_RE = re.compile(r"\d{8}_\d{6}")
-TRACE_RE = re.compile(r"Core 0:\s+(.+)")
-WALL_RE = re.compile(r"WALL_CLOCK_TIME:\s+(\d+:\d{2}:\d{2})")
 
+# "Core 0:" is near the start of a log and WALL_CLOCK_TIME at the end
+HEAD_BYTES = 16 * 1024
+TAIL_BYTES = 8 * 1024
 
-def hms_to_seconds(hms: str) -> int:
-    h, m, s = map(int, hms.split(":"))
-    return h * 3600 + m * 60 + s
+CSV_HEADERS = ("trace_name", "wall_clock_time", "wall_clock_seconds", "log_file")
 
 
-def extract_from_log(log_path: Path):
-    trace_name = None
-    wall_time = None
+def parse_trace(rest: bytes):
+    if rest[:1] not in (b" ", b"\t"):
+        return None
+
+    path = rest.lstrip(b" \t").rstrip()
+    if not path or path[:1].isspace():
+        return None
+    return path
+
+
+def parse_wall(rest: bytes):
+    if rest[:1] not in (b" ", b"\t"):
+        return None
+
+    h, _, rest = rest.lstrip(b" \t").partition(b":")
+    mins, _, secs = rest.partition(b":")
+    secs = secs[:2]
+    if not (h.isdigit() and len(mins) == 2 and mins.isdigit()
+            and len(secs) == 2 and secs.isdigit()):
+        return None
+    return h, mins, secs
+
 
-    with log_path.open("r", errors="ignore") as f:
-        for line in f:
-            if trace_name is None:
-                m = TRACE_RE.search(line)
-                if m:
-                    trace_path = Path(m.group(1))
-                    trace_name = trace_path.name
+def find_field(buf, anchor: bytes, parse, partial=False):
+    # With partial, buf may end mid-line: ignore an unterminated last line
+    pos = buf.find(anchor)
+    while pos >= 0:
+        eol = buf.find(b"\n", pos)
+        if eol < 0:
+            if partial:
+                return None
+            eol = len(buf)
 
-            if wall_time is None:
-                m = WALL_RE.search(line)
-                if m:
-                    wall_time = m.group(1)
+        value = parse(buf[pos + len(anchor):eol])
+        if value is not None:
+            return value
+        pos = buf.find(anchor, pos + 1)
+    return None
 
-            if trace_name and wall_time:
-                break
 
-    if not trace_name or not wall_time:
+def build_row(trace, wall, log_path: str):
+    if trace is None or wall is None:
+        return None
+
+    trace_name = posixpath.basename(trace).decode(errors="ignore")
+    if not trace_name:
         return None
 
-    return {
-        "trace_name": trace_name,
-        "wall_clock_time": wall_time,
-        "wall_clock_seconds": hms_to_seconds(wall_time),
-        "log_file": log_path.name,
-    }
+    h, mins, secs = wall
+    wall_seconds = int(h) * 3600 + int(mins) * 60 + int(secs)
+    wall_time = b":".join(wall).decode("ascii")
+
+    return (trace_name, wall_time, wall_seconds, os.path.basename(log_path))
+
+
+def extract_from_log(log_path: str):
+    with open(log_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return None
 
+        whole = size <= HEAD_BYTES + TAIL_BYTES
+        if whole:
+            head = tail = f.read()
+        else:
+            head = f.read(HEAD_BYTES)
+            f.seek(size - TAIL_BYTES)
+            tail = f.read()
 
-def process_baseline_dir(baseline_dir: Path):
-    timestamps = [
-        d for d in baseline_dir.iterdir()
-        if d.is_dir() and TIMESTAMP_RE.fullmatch(d.name)
-    ]
+        trace = find_field(head, b"Core 0:", parse_trace, partial=not whole)
+        wall = find_field(tail, b"WALL_CLOCK_TIME:", parse_wall)
 
-    if not timestamps:
+        if whole or (trace and wall):
+            return build_row(trace, wall, log_path)
+
+        # Not where expected: search the whole log
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if trace is None:
+                trace = find_field(mm, b"Core 0:", parse_trace)
+            if wall is None:
+                wall = find_field(mm, b"WALL_CLOCK_TIME:", parse_wall)
+
+    return build_row(trace, wall, log_path)
+
+
+def process_baseline_dir(baseline_dir: Path, executor):
+    with os.scandir(baseline_dir) as it:
+        timestamps = [
+            e for e in it
+            if TIMESTAMP_RE.fullmatch(e.name) and e.is_dir()
+        ]
+
+    latest = max(timestamps, key=attrgetter("name"), default=None)
+    if latest is None:
         return
 
-    latest = sorted(timestamps)[-1]
+    latest = Path(latest.path)
+
+    with os.scandir(latest) as it:
+        logs = sorted(
+            e.path for e in it if e.name.endswith(".log") and e.is_file()
+        )
 
-    rows = []
-    for log_file in sorted(latest.glob("*.log")):
-        result = extract_from_log(log_file)
-        if result:
-            rows.append(result)
+    results = executor.map(extract_from_log, logs, chunksize=16)
+    rows = [result for result in results if result]
 
     if not rows:
         return
@@ -72,38 +134,57 @@ def process_baseline_dir(baseline_dir: Path):
     )
     csv_path = latest / csv_name
 
-    with csv_path.open("w", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "trace_name",
-                "wall_clock_time",
-                "wall_clock_seconds",
-                "log_file",
-            ],
-        )
-        writer.writeheader()
+    with csv_path.open("w", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADERS)
         writer.writerows(rows)
 
     print(f"Wrote CSV: {csv_path} ({len(rows)} traces)")
 
 
-def main(root_dir: Path, baseline_name: str):
-    for path in root_dir.rglob(baseline_name):
-        if path.is_dir():
-            process_baseline_dir(path)
+def find_baseline_dirs(root, baseline_name: str):
+    # Like rglob(): symlinked and unreadable directories are not descended into
+    try:
+        it = os.scandir(root)
+    except PermissionError:
+        return
+
+    with it:
+        for entry in it:
+            if entry.name == baseline_name:
+                if entry.is_dir():
+                    yield Path(entry.path)
+            elif entry.is_dir(follow_symlinks=False):
+                yield from find_baseline_dirs(entry.path, baseline_name)
+
+
+def main(root_dir: Path, baseline_name: str, threads: bool = False):
+    # Threads suit slow shared filesystems, where reads dominate
+    if threads:
+        executor = ThreadPoolExecutor(max_workers=8)
+    else:
+        executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+    with executor:
+        for path in find_baseline_dirs(root_dir, baseline_name):
+            process_baseline_dir(path, executor)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print(f"Usage: {sys.argv[0]} <results_root> <baseline_dir_name>")
+    args = sys.argv[1:]
+    threads = "--threads" in args
+    if threads:
+        args.remove("--threads")
+
+    if len(args) != 2:
+        print(f"Usage: {sys.argv[0]} <results_root> <baseline_dir_name> [--threads]")
         sys.exit(1)
 
-    root = Path(sys.argv[1]).resolve()
-    baseline_name = sys.argv[2]
+    root = Path(args[0]).resolve()
+    baseline_name = args[1]
 
     if not root.exists():
         print(f"ERROR: {root} does not exist")
         sys.exit(1)
 
-    main(root, baseline_name)
\ No newline at end of file
+    main(root, baseline_name, threads)
\ No newline at end of file
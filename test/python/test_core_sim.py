@@ -0,0 +1,121 @@
+import unittest
+import tempfile
+import os
+
+import core_sim
+
+HEADER = '\n*** ChampSim Multicore Out-of-Order Simulator ***\nWarmup Instructions: 100\nSimulation Instructions: 200\nNumber of CPUs: 1\n'
+STATS = '\nChampSim completed all CPUs\n\nCPU 0 cumulative IPC: 1.25 instructions: 200 cycles: 160\n'
+
+def footer(status):
+    return f'\n====\nWALL_CLOCK_TIME: 0:00:01\nEXIT_STATUS: {status}\n====\n'
+
+class ManagerTestCase(unittest.TestCase):
+    def setUp(self):
+        dtemp = tempfile.TemporaryDirectory()
+        self.addCleanup(dtemp.cleanup)
+        self.root = dtemp.name
+        self.traces_dir = os.path.join(self.root, 'traces')
+        os.mkdir(self.traces_dir)
+
+    def manager(self, skip_patterns=(), warmup_instrs=100, sim_instrs=200):
+        return core_sim.SimulationManager(
+            champsim_root=self.root,
+            config_file=os.path.join(self.root, 'missing.json'),
+            traces_dir=self.traces_dir,
+            num_parallel=1,
+            warmup_instrs=warmup_instrs,
+            sim_instrs=sim_instrs,
+            skip_patterns=set(skip_patterns),
+        )
+
+class AlreadyDoneTests(ManagerTestCase):
+    def already_done(self, text, **kwargs):
+        manager = self.manager(**kwargs)
+        manager.create_result_dir()
+        with open(manager.results_base / 'mcf.log', 'wt') as wfp:
+            wfp.write(text)
+        return manager._already_done('mcf.champsimtrace.xz')
+
+    def test_success(self):
+        self.assertTrue(self.already_done(HEADER + STATS + footer(0)))
+
+    def test_missing_footer(self):
+        self.assertFalse(self.already_done(HEADER + STATS))
+
+    def test_nonzero_status(self):
+        self.assertFalse(self.already_done(HEADER + STATS + footer(1)))
+
+    def test_footer_without_sentinel(self):
+        self.assertFalse(self.already_done(HEADER + footer(0)))
+
+    def test_empty_log(self):
+        self.assertFalse(self.already_done(''))
+
+    def test_missing_log(self):
+        self.assertFalse(self.manager()._already_done('mcf.champsimtrace.xz'))
+
+    def test_other_instruction_counts(self):
+        self.assertFalse(self.already_done(HEADER + STATS + footer(0), sim_instrs=300))
+        self.assertFalse(self.already_done(HEADER + STATS + footer(0), warmup_instrs=10))
+
+    def test_no_header(self):
+        self.assertFalse(self.already_done(STATS + footer(0)))
+
+class ResultFilenameTests(ManagerTestCase):
+    def test_suffixes_stripped(self):
+        manager = self.manager()
+        self.assertEqual(manager.get_result_filename('/traces/mcf.champsimtrace.xz'), 'mcf.log')
+        self.assertEqual(manager.get_result_filename('/traces/mcf.champsimtrace.gz'), 'mcf.log')
+        self.assertEqual(manager.get_result_filename('/traces/mcf.trace.xz'), 'mcf.log')
+
+    def test_unknown_suffix_kept(self):
+        self.assertEqual(self.manager().get_result_filename('/traces/mcf.bin'), 'mcf.bin.log')
+
+class SkipPatternTests(ManagerTestCase):
+    def test_no_patterns(self):
+        self.assertIsNone(self.manager()._skip_re)
+
+    def test_substring_match(self):
+        skip_re = self.manager(['mcf', 'lbm'])._skip_re
+        self.assertTrue(skip_re.search('605.mcf_s-484B.champsimtrace.xz'))
+        self.assertTrue(skip_re.search('619.lbm_s-2676B.champsimtrace.xz'))
+        self.assertFalse(skip_re.search('602.gcc_s-734B.champsimtrace.xz'))
+
+    def test_patterns_are_literal(self):
+        skip_re = self.manager(['a.c', 'x+'])._skip_re
+        self.assertFalse(skip_re.search('abc.xz'))
+        self.assertTrue(skip_re.search('a.c.xz'))
+        self.assertTrue(skip_re.search('x+.xz'))
+        self.assertFalse(skip_re.search('xx.xz'))
+
+class ExpectedRuntimeTests(ManagerTestCase):
+    def add_trace(self, name, size):
+        with open(os.path.join(self.traces_dir, name), 'wb') as wfp:
+            wfp.write(b'x' * size)
+
+    def test_no_history(self):
+        self.add_trace('a.champsimtrace.xz', 100)
+        self.add_trace('b.champsimtrace.xz', 300)
+        self.assertEqual(self.manager().expected_runtimes({}), {'a.champsimtrace.xz': 100, 'b.champsimtrace.xz': 300})
+
+    def test_median_rate(self):
+        for name in 'abcd':
+            self.add_trace(f'{name}.champsimtrace.xz', 100)
+        history = {'a.champsimtrace.xz': 100.0, 'b.champsimtrace.xz': 300.0, 'c.champsimtrace.xz': 1000.0}
+        expected = self.manager().expected_runtimes(history)
+        self.assertEqual(expected['a.champsimtrace.xz'], 100.0)
+        self.assertEqual(expected['c.champsimtrace.xz'], 1000.0)
+        self.assertEqual(expected['d.champsimtrace.xz'], 300.0)
+
+    def test_history_for_missing_trace_ignored(self):
+        self.add_trace('a.champsimtrace.xz', 100)
+        expected = self.manager().expected_runtimes({'gone.champsimtrace.xz': 5000.0})
+        self.assertEqual(expected, {'a.champsimtrace.xz': 100})
+
+    def test_zero_size_traces(self):
+        self.add_trace('a.champsimtrace.xz', 0)
+        self.add_trace('b.champsimtrace.xz', 0)
+        self.add_trace('c.champsimtrace.xz', 100)
+        expected = self.manager().expected_runtimes({'a.champsimtrace.xz': 50.0, 'c.champsimtrace.xz': 200.0})
+        self.assertEqual(expected, {'a.champsimtrace.xz': 50.0, 'b.champsimtrace.xz': 0, 'c.champsimtrace.xz': 200.0})
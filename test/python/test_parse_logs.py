@@ -0,0 +1,127 @@
+import unittest
+import tempfile
+import contextlib
+import io
+import json
+import os
+
+import parse_logs
+
+ROI_STATS = [
+    'CPU 0 cumulative IPC: 1.25 instructions: 50000000 cycles: 40000000',
+    'cpu0->cpu0_L1D TOTAL        ACCESS:       1000 HIT:        900 MISS:        100 MSHR_MERGE:          0',
+    'cpu0->cpu0_L1D LOAD         ACCESS:        800 HIT:        750 MISS:         50 MSHR_MERGE:          0',
+    'cpu0->cpu0_L1D PREFETCH REQUESTED:         50 ISSUED:         40 USEFUL:         20 USELESS:          5',
+    'cpu0->cpu0_L1D AVERAGE MISS LATENCY: 12.5 cycles',
+    'cpu0->cpu0_L2C TOTAL        ACCESS:          0 HIT:          0 MISS:          0 MSHR_MERGE:          0',
+    'cpu0->cpu0_L2C PREFETCH REQUESTED:          0 ISSUED:          0 USEFUL:          0 USELESS:          0',
+    'cpu0->cpu0_L2C AVERAGE MISS LATENCY: - cycles',
+]
+
+HEARTBEAT = [
+    '*** ChampSim Multicore Out-of-Order Simulator ***',
+    'Heartbeat CPU 0 instructions: 10000000 cycles: 5000000 heartbeat IPC: 2 cumulative IPC: 2 (Simulation time: 00 hr 00 min 10 sec)',
+]
+
+def log_text(*sections):
+    return '\n'.join(line for section in sections for line in section) + '\n'
+
+class ParseLogFileTests(unittest.TestCase):
+    def parse(self, text, name='605.mcf_s-484B.log'):
+        with tempfile.TemporaryDirectory() as dtemp:
+            fname = os.path.join(dtemp, name)
+            with open(fname, 'wt') as wfp:
+                wfp.write(text)
+            return parse_logs.LogParser.parse_log_file(fname)
+
+    def test_plain_printer_log(self):
+        metrics = self.parse(log_text(HEARTBEAT, ['', 'ChampSim completed all CPUs', '', 'Region of Interest Statistics', ''], ROI_STATS))
+        self.assertEqual(metrics['trace_name'], '605.mcf_s-484B')
+        self.assertEqual(metrics['IPC'], 1.25)
+        self.assertEqual(metrics['L1D_total_access'], 1000)
+        self.assertEqual(metrics['L1D_miss_rate'], 10.0)
+        self.assertEqual(metrics['L1D_avg_miss_latency'], 12.5)
+        self.assertEqual(metrics['L1D_prefetch_accuracy'], 40.0)
+
+    def test_zero_totals(self):
+        metrics = self.parse(log_text(['ChampSim completed all CPUs'], ROI_STATS))
+        self.assertEqual(metrics['L2C_total_access'], 0)
+        self.assertEqual(metrics['L2C_miss_rate'], 0)
+        self.assertEqual(metrics['L2C_prefetch_accuracy'], 0)
+
+    def test_dash_latency(self):
+        metrics = self.parse(log_text(['ChampSim completed all CPUs'], ROI_STATS))
+        self.assertIsNone(metrics['L2C_avg_miss_latency'])
+
+    def test_missing_cache(self):
+        metrics = self.parse(log_text(['ChampSim completed all CPUs'], ROI_STATS))
+        for header in ('LLC_total_access', 'LLC_miss_rate', 'LLC_avg_miss_latency', 'LLC_prefetch_accuracy'):
+            self.assertIsNone(metrics[header])
+
+    def test_no_sentinel(self):
+        metrics = self.parse(log_text(HEARTBEAT, ROI_STATS))
+        self.assertEqual(metrics['IPC'], 1.25)
+        self.assertEqual(metrics['L1D_total_access'], 1000)
+
+    def test_first_section_wins(self):
+        later = [line.replace('1.25', '9.5').replace('1000', '7777') for line in ROI_STATS]
+        metrics = self.parse(log_text(['ChampSim completed all CPUs'], ROI_STATS, later))
+        self.assertEqual(metrics['IPC'], 1.25)
+        self.assertEqual(metrics['L1D_total_access'], 1000)
+
+    def test_dash_ipc_skipped(self):
+        dash = ['CPU 0 cumulative IPC: - instructions: 0 cycles: 0']
+        metrics = self.parse(log_text(['ChampSim completed all CPUs'], dash, ROI_STATS))
+        self.assertEqual(metrics['IPC'], 1.25)
+
+    def test_stats_only_at_line_start(self):
+        metrics = self.parse(log_text(HEARTBEAT, ['ChampSim completed all CPUs']))
+        self.assertIsNone(metrics['IPC'])
+
+    def test_truncated_line(self):
+        truncated = ['CPU 0 cumulative IPC: 1.5 instructions: 50000000 cycles: 33333333', 'cpu0->cpu0_L1D TOTAL  ACCESS: 1000 HIT:']
+        metrics = self.parse(log_text(['ChampSim completed all CPUs'], truncated))
+        self.assertEqual(metrics['IPC'], 1.5)
+        self.assertEqual(metrics['L1D_total_access'], 1000)
+        for header in parse_logs.CSV_HEADERS[3:]:
+            self.assertIsNone(metrics[header])
+
+    def test_truncated_ipc_line(self):
+        metrics = self.parse(log_text(['ChampSim completed all CPUs', 'CPU 0 cumulative IPC:'], ROI_STATS))
+        self.assertEqual(metrics['IPC'], 1.25)
+
+    def test_empty_file(self):
+        metrics = self.parse('')
+        self.assertEqual(metrics['trace_name'], '605.mcf_s-484B')
+        self.assertEqual(set(metrics), set(parse_logs.CSV_HEADERS))
+        for header in parse_logs.CSV_HEADERS[1:]:
+            self.assertIsNone(metrics[header])
+
+    def test_trace_suffix_stripped(self):
+        metrics = self.parse('', name='mcf.champsimtrace.log')
+        self.assertEqual(metrics['trace_name'], 'mcf')
+
+class CacheTests(unittest.TestCase):
+    def test_version_mismatch_ignored(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            parser = parse_logs.LogParser(dtemp)
+            with open(parser.cache_path, 'wt') as wfp:
+                json.dump({'version': parse_logs.CACHE_VERSION - 1, 'logs': {'a.log': {}}}, wfp)
+            self.assertEqual(parser.load_cache(), {})
+
+    def test_unversioned_ignored(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            parser = parse_logs.LogParser(dtemp)
+            with open(parser.cache_path, 'wt') as wfp:
+                json.dump({'a.log': {'mtime_ns': 1, 'size': 1, 'metrics': {}}}, wfp)
+            self.assertEqual(parser.load_cache(), {})
+
+    def test_reuse_unchanged(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            with open(os.path.join(dtemp, 'a.log'), 'wt') as wfp:
+                wfp.write(log_text(['ChampSim completed all CPUs'], ROI_STATS))
+            with contextlib.redirect_stdout(io.StringIO()):
+                first = parse_logs.LogParser(dtemp).process_directory()
+                parser = parse_logs.LogParser(dtemp)
+                self.assertEqual(parser.scan(), [])
+                self.assertEqual(parser.store([], []), first)
@@ -0,0 +1,79 @@
+import unittest
+import tempfile
+import os
+
+import parse_walltime
+
+class ParseTraceTests(unittest.TestCase):
+    def test_space(self):
+        self.assertEqual(parse_walltime.parse_trace(b' /traces/mcf.champsimtrace.xz'), b'/traces/mcf.champsimtrace.xz')
+
+    def test_tab(self):
+        self.assertEqual(parse_walltime.parse_trace(b'\t/traces/mcf.xz'), b'/traces/mcf.xz')
+
+    def test_crlf(self):
+        self.assertEqual(parse_walltime.parse_trace(b' /traces/mcf.xz  \r'), b'/traces/mcf.xz')
+
+    def test_no_separator(self):
+        self.assertIsNone(parse_walltime.parse_trace(b'/traces/mcf.xz'))
+
+    def test_empty(self):
+        self.assertIsNone(parse_walltime.parse_trace(b''))
+        self.assertIsNone(parse_walltime.parse_trace(b'   '))
+
+class ParseWallTests(unittest.TestCase):
+    def test_hms(self):
+        self.assertEqual(parse_walltime.parse_wall(b' 1:02:03'), (b'1', b'02', b'03'))
+
+    def test_tab(self):
+        self.assertEqual(parse_walltime.parse_wall(b'\t12:03:04'), (b'12', b'03', b'04'))
+
+    def test_crlf(self):
+        self.assertEqual(parse_walltime.parse_wall(b' 0:00:05\r'), (b'0', b'00', b'05'))
+
+    def test_trailing_digits(self):
+        self.assertEqual(parse_walltime.parse_wall(b' 12:03:045'), (b'12', b'03', b'04'))
+
+    def test_days(self):
+        self.assertIsNone(parse_walltime.parse_wall(b' 1 day, 0:00:01'))
+
+    def test_single_digit_minutes(self):
+        self.assertIsNone(parse_walltime.parse_wall(b' 12:3:04'))
+
+    def test_no_separator(self):
+        self.assertIsNone(parse_walltime.parse_wall(b'1:00:00'))
+
+class ExtractTests(unittest.TestCase):
+    def extract(self, data):
+        with tempfile.TemporaryDirectory() as dtemp:
+            fname = os.path.join(dtemp, 'mcf.log')
+            with open(fname, 'wb') as wfp:
+                wfp.write(data)
+            return parse_walltime.extract_from_log(fname)
+
+    def test_short_log(self):
+        data = b'Core 0: /traces/mcf.xz\nWALL_CLOCK_TIME: 1:02:03\n'
+        self.assertEqual(self.extract(data), ('mcf.xz', '1:02:03', 3723, 'mcf.log'))
+
+    def test_crlf_log(self):
+        data = b'Core 0: /traces/mcf.xz\r\nWALL_CLOCK_TIME: 0:00:07\r\n'
+        self.assertEqual(self.extract(data), ('mcf.xz', '0:00:07', 7, 'mcf.log'))
+
+    def test_first_valid_match(self):
+        data = b'Core 0:\nCore 0: /traces/mcf.xz\nWALL_CLOCK_TIME: 1 day, 0:00:01\nWALL_CLOCK_TIME: 0:00:02\n'
+        self.assertEqual(self.extract(data), ('mcf.xz', '0:00:02', 2, 'mcf.log'))
+
+    def test_head_boundary_straddle(self):
+        pad = b'x' * (parse_walltime.HEAD_BYTES - 20) + b'\n'
+        data = pad + b'Core 0: /traces/some-long-trace-name.champsimtrace.xz\n' + b'y\n' * 20000 + b'WALL_CLOCK_TIME: 0:00:05\n'
+        self.assertEqual(self.extract(data), ('some-long-trace-name.champsimtrace.xz', '0:00:05', 5, 'mcf.log'))
+
+    def test_footer_outside_tail(self):
+        data = b'Core 0: /traces/mcf.xz\nWALL_CLOCK_TIME: 0:00:05\n' + b'z\n' * 20000
+        self.assertEqual(self.extract(data), ('mcf.xz', '0:00:05', 5, 'mcf.log'))
+
+    def test_no_footer(self):
+        self.assertIsNone(self.extract(b'Core 0: /traces/mcf.xz\n' + b'z\n' * 20000))
+
+    def test_empty_file(self):
+        self.assertIsNone(self.extract(b''))